@@ -6,43 +6,59 @@ from PyQt6.QtGui import QIcon
 
 from scr.mainWindow import GameLauncher
 
+_DARK_QSS = """
+QWidget {
+    background-color: #2E2E2E;
+    color: #FFFFFF;
+}
+QMainWindow {
+    background-color: #2E2E2E;
+    color: #FFFFFF;
+}
+QWindow {
+    background-color: #2E2E2E;
+    color: #FFFFFF;
+}
+QStatusBar {
+    background-color: #333333;
+    color: #FFFFFF;
+}
+QPushButton {
+    background-color: #444444;
+    color: #FFFFFF;
+}
+QPushButton:hover {
+    background-color: #555555;
+}
+QLineEdit {
+    background-color: #333333;
+    color: #FFFFFF;
+}
+"""
+
+# Built on first use: QIcon needs a running QApplication
+_APP_ICON = None
+
+
 def apply_dark_theme(app):
-    dark_style = """
-    QWidget {
-        background-color: #2E2E2E;
-        color: #FFFFFF;
-    }
-    QMainWindow {
-        background-color: #2E2E2E;
-        color: #FFFFFF;
-    }
-    QWindow {
-        background-color: #2E2E2E;
-        color: #FFFFFF;
-    }
-    QStatusBar {
-        background-color: #333333;
-        color: #FFFFFF;
-    }
-    QPushButton {
-        background-color: #444444;
-        color: #FFFFFF;
-    }
-    QPushButton:hover {
-        background-color: #555555;
-    }
-    QLineEdit {
-        background-color: #333333;
-        color: #FFFFFF;
-    }
-    """
-    app.setStyleSheet(dark_style)
-    _app_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-    app.setWindowIcon(QIcon(os.path.join(_app_dir, "scr", "icon.ico")))
+    global _APP_ICON
+    app.setStyleSheet(_DARK_QSS)
+    if _APP_ICON is None:
+        _app_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+        _APP_ICON = QIcon(os.path.join(_app_dir, "scr", "icon.ico"))
+    app.setWindowIcon(_APP_ICON)
+
+
+def shutdown_settings_writer():
+    # The settings dialog module is imported on first use; nothing to flush if it never was
+    config_window = sys.modules.get("scr.configWindow")
+    if config_window is not None:
+        config_window.shutdown_writer()
 
       
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(shutdown_settings_writer)
     ex = GameLauncher()
     apply_dark_theme(app)
     ex.show()
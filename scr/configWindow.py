@@ -1,123 +1,208 @@
 import os
+import re
 import shutil
+import textwrap
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+
+# Victoria II's folder under the user's Documents; user_dir subfolders live below it
+_V2_BASE = os.path.join(os.path.expanduser("~"), "Documents", "Paradox Interactive", "Victoria II")
+
+# Written verbatim when the user_dir has no settings.txt yet
+_DEFAULT_SETTINGS_BYTES = textwrap.dedent("""\
+    gui=
+    {
+    language=l_english
+    }
+    graphics=
+    {
+    size=
+    {
+        x=1920
+        y=1080
+    }
+
+    refreshRate=60
+    fullScreen=no
+    borderless=yes
+    shadows=no
+    shadowSize=2048
+    multi_sampling=0
+    anisotropic_filtering=0
+    gamma=50.000000
+    }
+    sound_fx_volume=100.000000
+    music_volume=100.000000
+    scroll_speed=50.000000
+    camera_rotation_speed=50.000000
+    zoom_speed=50.000000
+    mouse_speed=50.000000
+    master_volume=100.000000
+    ambient_volume=50.000000
+    mapRenderingOptions=
+    {
+    renderTrees=yes
+    onmap=yes
+    simpleWater=no
+    counter_distance=300.000000
+    text_height=300.000000
+    sea_text_alpha=120
+    details=1.000
+    }
+    lastplayer="Player"
+    lasthost=""
+    serveradress="diplomacy.valkyrienet.com"
+    debug_saves=0
+    autosave="YEARLY"
+    simple=no
+    categories=
+    {
+    1 1 1 1 1 1 }
+    update_time=1.000000
+    shortcut=yes
+""").encode("utf-8")
+
+# Single worker so queued disk writes land in the order they were submitted
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="settings_writer")
+
+
+def _report_write_error(future):
+    error = future.exception()
+    if error is not None:
+        print(f"Error writing settings: {error}")
+
+
+def submit_write(fn, *args):
+    """Queues fn(*args) on the background writer so the UI thread never blocks on disk I/O."""
+    future = _writer.submit(fn, *args)
+    future.add_done_callback(_report_write_error)
+    return future
+
+
+def flush_pending_writes():
+    """Blocks until every write queued so far has finished."""
+    _writer.submit(lambda: None).result()
+
+
+def shutdown_writer():
+    """Waits for pending writes and stops the writer thread. Call on application exit."""
+    _writer.shutdown(wait=True)
+
+
+def _remove_folders(folders):
+    """Deletes the given folders concurrently, skipping any that don't exist."""
+    folders = [folder for folder in folders if os.path.isdir(folder)]
+    if not folders:
+        return
+    with ThreadPoolExecutor(max_workers=len(folders)) as pool:
+        list(pool.map(shutil.rmtree, folders))
+
+
+# key=value or key="value" on a single line; block openers/closers and bare values never match
+_SETTING_LINE_RE = re.compile(r'^\s*([A-Za-z_]\w*)\s*=\s*"?([^"\n{}]*)"?\s*$')
+
+
+def _atomic_write(path, data):
+    """Writes data to a sibling .tmp file and swaps it in, so a crash never leaves a half-written file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(data)
+    # No os.fsync: the rename already gives all-or-nothing replacement, and
+    # forcing a disk flush on every OK click costs far more than it protects.
+    os.replace(tmp_path, path)
+
 
 class SettingsManager:
     def __init__(self, settings_file):
         self.settings_file = settings_file
-        self.settings = {}
+
+    @cached_property
+    def settings(self):
+        """The parsed settings; the file is only read on first access."""
         self.load_settings()
+        return self.__dict__["settings"]
 
     def load_settings(self):
         """Loads settings from the file into a dictionary."""
         if not os.path.exists(self.settings_file):
             self.create_default_settings()
 
-        self.settings = {}
-        
         with open(self.settings_file, "r", encoding="utf-8") as file:
-            for line in file:
-                line = line.strip()
-                # Skip empty lines and lines with braces
-                if not line or line.startswith("{") or line.startswith("}"):
-                    continue
-                
-                if "=" in line:
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip().strip('"')  # Remove surrounding quotes if present
-                    self.settings[key] = value
+            self._lines = file.readlines()
+
+        matches = [(i, m) for i, m in enumerate(map(_SETTING_LINE_RE.match, self._lines)) if m]
+        self.settings = {m.group(1): m.group(2).strip() for _, m in matches}
+        self._line_index = {m.group(1): i for i, m in matches}  # key -> index of the line it was read from
 
     def save_settings(self):
         """Saves the current settings to the file."""
-        with open(self.settings_file, "w", encoding="utf-8") as file:
-            for key, value in self.settings.items():
-                file.write(f"{key}={value}\n")
+        _atomic_write(self.settings_file, "".join(f"{key}={value}\n" for key, value in self.settings.items()))
+
+    def save_updates(self, updates):
+        """Patches the lines of the given keys in the cached file contents and writes it back once."""
+        settings = self.settings  # Reads the file if nothing has yet
+        for key, value in updates.items():
+            settings[key] = value
+            i = self._line_index.get(key)
+            if i is None:
+                # Key not in the file yet: append it so the change isn't silently dropped
+                if self._lines and not self._lines[-1].endswith("\n"):
+                    self._lines[-1] += "\n"
+                self._line_index[key] = len(self._lines)
+                self._lines.append(f"{key}={value}\n")
+                continue
+            line = self._lines[i]
+            indent = line[:len(line) - len(line.lstrip())]
+            self._lines[i] = f"{indent}{key}={value}\n"
+
+        _atomic_write(self.settings_file, "".join(self._lines))
 
     def get_setting(self, key, default=None):
         """Returns the value of a specific setting, or a default if not found."""
         return self.settings.get(key, default)
 
     def create_default_settings(self):
-        default_settings = """gui=
-            {
-            language=l_english
-            }
-            graphics=
-            {
-            size=
-            {
-                x=1920
-                y=1080
-            }
-
-            refreshRate=60
-            fullScreen=no
-            borderless=yes
-            shadows=no
-            shadowSize=2048
-            multi_sampling=0
-            anisotropic_filtering=0
-            gamma=50.000000
-            }
-            sound_fx_volume=100.000000
-            music_volume=100.000000
-            scroll_speed=50.000000
-            camera_rotation_speed=50.000000
-            zoom_speed=50.000000
-            mouse_speed=50.000000
-            master_volume=100.000000
-            ambient_volume=50.000000
-            mapRenderingOptions=
-            {
-            renderTrees=yes
-            onmap=yes
-            simpleWater=no
-            counter_distance=300.000000
-            text_height=300.000000
-            sea_text_alpha=120
-            details=1.000
-            }
-            lastplayer="Player"
-            lasthost=""
-            serveradress="diplomacy.valkyrienet.com"
-            debug_saves=0
-            autosave="YEARLY"
-            simple=no
-            categories=
-            {
-            1 1 1 1 1 1 }
-            update_time=1.000000
-            shortcut=yes
-            """
-        with open(self.settings_file, "w", encoding="utf-8") as file:
-            file.write(default_settings)
+        with open(self.settings_file, "wb") as file:
+            file.write(_DEFAULT_SETTINGS_BYTES)
 
 from PyQt6.QtWidgets import (
     QHBoxLayout, QLabel, QVBoxLayout, QDialog, QFormLayout, QLineEdit, QSlider,
     QPushButton, QMessageBox, QCheckBox, QComboBox, QFileDialog
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 import os
 
 class ConfigDialog(QDialog):
+    _RESOLUTIONS = ("3840x2160", "2560x1440", "1920x1080", "1600x900", "1366x768", "1280x720", "1024x600", "800x600")
+    _AUTOSAVE_OPTIONS = ("FIVE_YEAR", "YEARLY", "HALFYEAR", "MONTHLY")
+    # (widget attribute, settings.txt key, row label)
+    _VOLUME_SLIDERS = (
+        ("master_volume_slider", "master_volume", "Master Volume:"),
+        ("music_volume_slider", "music_volume", "Music Volume:"),
+        ("sound_fx_slider", "sound_fx_volume", "Sound FX Volume:"),
+        ("ambient_volume_slider", "ambient_volume", "Ambient Volume:"),
+    )
+    # Emitted from the writer thread when clearing the cache ends ("" or the error); handled on the UI thread
+    _cache_cleared = pyqtSignal(str)
+
     def __init__(self, current_root, parent, user_dir):
         super().__init__(parent)
         self.setWindowTitle("Configuration")
         self.setGeometry(400, 400, 400, 400)
         self.user_dir = user_dir
-        self.settings_path = os.path.join(
-            os.path.expanduser("~"),
-            "Documents",
-            "Paradox Interactive",
-            "Victoria II",
-            self.user_dir,
-            "settings.txt"
-        )
+        self.settings_path = os.path.join(_V2_BASE, self.user_dir, "settings.txt")
         self.game_root = current_root
         self.launcher_settings_file = os.path.join(self.game_root, "mod", "launcher_configs.json")
+        self._launcher_config = self._read_launcher_config()
         self.settings_manager = SettingsManager(self.settings_path)
         self.initUI()
+        self._initial_state = self._widget_state()
+        self._cache_cleared.connect(self._on_cache_cleared)
+
+    def _read_launcher_config(self):
+        with open(self.launcher_settings_file, "r", encoding="utf-8") as file:
+            return json.load(file)
 
     def _game_root_has_executable(self, path):
         """Return True if path contains v2game.exe."""
@@ -147,8 +232,7 @@ class ConfigDialog(QDialog):
         main_layout = QVBoxLayout(self)
         layout = QFormLayout()
 
-        with open(self.launcher_settings_file, "r", encoding="utf-8") as file:
-            launcher_config = json.load(file)
+        launcher_config = self._launcher_config
 
         # Game directory (path to Victoria II install)
         self.game_directory_input = QLineEdit(self.game_root or "")
@@ -163,15 +247,7 @@ class ConfigDialog(QDialog):
 
         # Screen Resolution
         self.resolution_input = QComboBox()
-        self.resolution_input.addItem("3840x2160")
-        self.resolution_input.addItem("2560x1440")
-        self.resolution_input.addItem("1920x1080")
-        self.resolution_input.addItem("1600x900")
-        self.resolution_input.addItem("1366x768")
-        self.resolution_input.addItem("1280x720")
-        self.resolution_input.addItem("1024x600")
-        self.resolution_input.addItem("800x600")
-
+        self.resolution_input.addItems(self._RESOLUTIONS)
         self.resolution_input.setCurrentText(f"{self.settings_manager.get_setting('x')}x{self.settings_manager.get_setting('y')}")
         layout.addRow("Screen Resolution:", self.resolution_input)
 
@@ -190,29 +266,12 @@ class ConfigDialog(QDialog):
         layout.addRow(self.skip_intro_checkbox)
 
         # Sound Volume
-        self.master_volume_slider = QSlider(Qt.Orientation.Horizontal)
-        self.master_volume_slider.setMinimum(0)
-        self.master_volume_slider.setMaximum(100)
-        self.master_volume_slider.setValue(int(float(self.settings_manager.get_setting("master_volume"))))
-        layout.addRow("Master Volume:", self.master_volume_slider)
-
-        self.music_volume_slider = QSlider(Qt.Orientation.Horizontal)
-        self.music_volume_slider.setMinimum(0)
-        self.music_volume_slider.setMaximum(100)
-        self.music_volume_slider.setValue(int(float(self.settings_manager.get_setting("music_volume"))))
-        layout.addRow("Music Volume:", self.music_volume_slider)
-
-        self.sound_fx_slider = QSlider(Qt.Orientation.Horizontal)
-        self.sound_fx_slider.setMinimum(0)
-        self.sound_fx_slider.setMaximum(100)
-        self.sound_fx_slider.setValue(int(float(self.settings_manager.get_setting("sound_fx_volume"))))
-        layout.addRow("Sound FX Volume:", self.sound_fx_slider)
-
-        self.ambient_volume_slider = QSlider(Qt.Orientation.Horizontal)
-        self.ambient_volume_slider.setMinimum(0)
-        self.ambient_volume_slider.setMaximum(100)
-        self.ambient_volume_slider.setValue(int(float(self.settings_manager.get_setting("ambient_volume"))))
-        layout.addRow("Ambient Volume:", self.ambient_volume_slider)
+        for attr, key, label in self._VOLUME_SLIDERS:
+            slider = QSlider(Qt.Orientation.Horizontal)
+            slider.setRange(0, 100)
+            slider.setValue(int(float(self.settings_manager.get_setting(key) or 0)))
+            setattr(self, attr, slider)
+            layout.addRow(label, slider)
 
         # Last Player
         self.lastplayer_input = QLineEdit(self.settings_manager.get_setting("lastplayer"))
@@ -220,10 +279,7 @@ class ConfigDialog(QDialog):
 
         # Autosave
         self.autosave_input = QComboBox()
-        self.autosave_input.addItem("FIVE_YEAR")
-        self.autosave_input.addItem("YEARLY")
-        self.autosave_input.addItem("HALFYEAR")
-        self.autosave_input.addItem("MONTHLY")
+        self.autosave_input.addItems(self._AUTOSAVE_OPTIONS)
         self.autosave_input.setCurrentText(self.settings_manager.get_setting("autosave", "YEARLY"))
         layout.addRow("Autosave Frequency:", self.autosave_input)
 
@@ -278,7 +334,28 @@ class ConfigDialog(QDialog):
     def on_update_time_changed(self, value):
         self.update_time_slider_label.setText(f"{value}")    
 
+    def _widget_state(self):
+        """Snapshot of every value save_settings writes, used to detect a no-op OK."""
+        return {
+            "resolution": self.resolution_input.currentText(),
+            "fullscreen": self.fullscreen_checkbox.isChecked(),
+            "borderless": self.borderless_checkbox.isChecked(),
+            "skip_intro": self.skip_intro_checkbox.isChecked(),
+            **{key: getattr(self, attr).value() for attr, key, _ in self._VOLUME_SLIDERS},
+            "lastplayer": self.lastplayer_input.text(),
+            "autosave": self.autosave_input.currentText(),
+            "debug_saves": self.debug_saves_checkbox.isChecked(),
+            "realtime": self.realtime_mode_checkbox.isChecked(),
+            "merge_event_modifiers": self.merge_event_modifiers_checkbox.isChecked(),
+            "update_time": self.update_time_slider.value(),
+        }
+
     def save_settings(self):
+        # Nothing changed: skip rewriting both files
+        if self._new_game_root is None and self._widget_state() == self._initial_state:
+            self.accept()
+            return
+
         parent = self.parent()
         if self._new_game_root and self._game_root_has_executable(self._new_game_root):
             parent.game_root = self._new_game_root
@@ -287,29 +364,29 @@ class ConfigDialog(QDialog):
                 parent._save_game_root_to_settings(self._new_game_root)
             mod_folder = os.path.join(self._new_game_root, "mod")
             os.makedirs(mod_folder, exist_ok=True)
-            if not os.path.exists(parent.settings_file):
-                with open(parent.settings_file, "w", encoding="utf-8") as f:
-                    json.dump({
-                        "checked_mods": [],
-                        "game_root": self._new_game_root,
-                        "update_time": 1,
-                        "realtime": 0,
-                        "skipintro": 0,
-                        "presets": {},
-                        "merge_event_modifiers": 1,
-                    }, f, indent=4)
             self.game_root = self._new_game_root
             self.launcher_settings_file = parent.settings_file
+            if os.path.exists(self.launcher_settings_file):
+                self._launcher_config = self._read_launcher_config()
+            else:
+                # Written now so the mod scan below finds a complete file; this dialog's values follow via the writer
+                self._launcher_config = {
+                    "checked_mods": [],
+                    "game_root": self._new_game_root,
+                    "update_time": 1,
+                    "realtime": 0,
+                    "skipintro": 0,
+                    "presets": {},
+                    "merge_event_modifiers": 1,
+                }
+                _atomic_write(self.launcher_settings_file, json.dumps(self._launcher_config, indent=4))
             if hasattr(parent, "load_mods"):
                 parent.load_mods()
 
         updated_settings = {
             'fullScreen': "yes" if self.fullscreen_checkbox.isChecked() else "no",
             'borderless': "yes" if self.borderless_checkbox.isChecked() else "no",
-            'sound_fx_volume': f"{self.sound_fx_slider.value():.6f}",
-            'music_volume': f"{self.music_volume_slider.value():.6f}",
-            'master_volume': f"{self.master_volume_slider.value():.6f}",
-            'ambient_volume': f"{self.ambient_volume_slider.value():.6f}",
+            **{key: f"{getattr(self, attr).value():.6f}" for attr, key, _ in self._VOLUME_SLIDERS},
             'lastplayer': self.lastplayer_input.text(),
             'autosave': self.autosave_input.currentText(),
             'debug_saves': "1" if self.debug_saves_checkbox.isChecked() else "0",
@@ -317,45 +394,24 @@ class ConfigDialog(QDialog):
             'y': self.resolution_input.currentText().split('x')[1],
         }
 
-        # Read the existing settings
-        with open(self.settings_path, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-
-        # Replace or update lines that start with the keys
-        for key, value in updated_settings.items():
-            for i in range(len(lines)):
-                if lines[i].startswith(key):
-                    lines[i] = f"{key}={value}\n"
-                    break
-
-        # Write the updated lines back to the file
-        with open(self.settings_path, "w", encoding="utf-8") as file:
-            file.writelines(lines)
+        # Patch the lines loaded by the settings manager and write them back
+        submit_write(self.settings_manager.save_updates, updated_settings)
 
         # Update the update_time in the launcher config file
-        with open(self.launcher_settings_file, "r", encoding="utf-8") as file:
-            launcher_config = json.load(file)
-
+        launcher_config = self._launcher_config
         launcher_config["game_root"] = self.game_root
         launcher_config["update_time"] = f"{self.update_time_slider.value()}"
         launcher_config["realtime"] = "1" if self.realtime_mode_checkbox.isChecked() else "0"
         launcher_config["skipintro"] = "1" if self.skip_intro_checkbox.isChecked() else "0"
         launcher_config["merge_event_modifiers"] = "1" if self.merge_event_modifiers_checkbox.isChecked() else "0"
-        with open(self.launcher_settings_file, "w", encoding="utf-8") as file:
-            json.dump(launcher_config, file, indent=4)
+        submit_write(_atomic_write, self.launcher_settings_file, json.dumps(launcher_config, indent=4))
 
-        self.skip_intro_change(self.skip_intro_checkbox.isChecked())
+        submit_write(self.skip_intro_change, self.skip_intro_checkbox.isChecked())
 
         self.accept()
 
     def clear_cache(self):
-        cache_path = os.path.join(
-            os.path.expanduser("~"),
-            "Documents",
-            "Paradox Interactive",
-            "Victoria II",
-            self.user_dir
-        )
+        cache_path = os.path.join(_V2_BASE, self.user_dir)
         map_folder = os.path.join(cache_path, "map")
         gfx_folder = os.path.join(cache_path, "gfx")
         music_folder = os.path.join(cache_path, "music")
@@ -369,22 +425,28 @@ class ConfigDialog(QDialog):
         )
 
         if confirm_msg == QMessageBox.StandardButton.Yes:
-            for folder in [map_folder, gfx_folder, music_folder]:
-                if os.path.exists(folder):
-                    shutil.rmtree(folder)
-            pass  # Cache cleared
+            future = submit_write(_remove_folders, [map_folder, gfx_folder, music_folder])
+            self.clean_cache_button.setEnabled(False)
+            self.clean_cache_button.setText("Clearing cache in the background…")
+            future.add_done_callback(self._report_cache_cleared)
         else:
             pass  # User cancelled
 
+    def _report_cache_cleared(self, future):
+        # Runs on the writer thread; the queued signal hands the result to the UI thread
+        error = future.exception()
+        self._cache_cleared.emit("" if error is None else (str(error) or type(error).__name__))
+
+    def _on_cache_cleared(self, error):
+        self.clean_cache_button.setEnabled(True)
+        self.clean_cache_button.setText("Clear Cache")
+        if error:
+            QMessageBox.warning(self, "Error", f"Failed to clear the cache: {error}")
+        elif self.isVisible():
+            QMessageBox.information(self, "Clear Cache", "The map, gfx and music cache folders were deleted.")
+
     def open_saves(self):
-        saves_folder = os.path.join(
-            os.path.expanduser("~"),
-            "Documents",
-            "Paradox Interactive",
-            "Victoria II",
-            self.user_dir,
-            "save games"
-        )
+        saves_folder = os.path.join(_V2_BASE, self.user_dir, "save games")
         if not os.path.exists(saves_folder):
             os.mkdir(saves_folder)
         else:
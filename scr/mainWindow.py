@@ -1,27 +1,162 @@
 
+import ctypes
 import os
 import json
+import re
 import sys
 import string
 import time
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from graphlib import CycleError, TopologicalSorter
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QMessageBox, QLabel, QFileDialog,
     QPushButton, QTreeWidget, QTreeWidgetItem, QTreeWidgetItemIterator,
     QSizePolicy, QDialog,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 import subprocess
-import threading
 
 from PyQt6.QtGui import QIcon
 
-from scr.configWindow import ConfigDialog
-from scr.presetmanagerWindow import PresetManagerDialog
-from scr.updatesWindow import UpdateCheckerDialog
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is used without it
+    orjson = None
+
 
 Z_LAUNCHER_NAME = "z_launcher"
 EVENT_MODIFIERS_FILE = "event_modifiers.txt"
+# A "key = value" line in event_modifiers.txt; comment lines and lines without "=" never match
+_EM_PAIR_RE = re.compile(r"\n[ \t]*([^#\s=][^=\n]*|)=([^\n]*)")
+
+# The whole update_time line of settings.txt, replaced with the launcher's value in start_game
+_UPDATE_TIME_RE = re.compile(r"^update_time.*$", re.MULTILINE)
+
+
+def _read_json(path):
+    """Read and parse a JSON file in one read, using orjson when it is installed."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _write_json(path, obj):
+    """Serialize obj and write it in one call. Always stdlib json, so the file stays ASCII and indented like the other writers."""
+    data = json.dumps(obj, indent=4).encode("ascii")
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _parse_mod_kv(line: str) -> tuple[str, str] | None:
+    # Supports formats like: key="value" or key = "value"
+    s = (line or "").strip()
+    if not s or s[0] == "#" or s.startswith("//"):
+        return None
+    key, sep, value = s.partition("=")
+    if not sep:
+        return None
+    value = value.strip()
+    if len(value) >= 2 and value[0] == '"' == value[-1]:
+        value = value[1:-1]
+    return key.strip(), value
+
+
+def _parse_mod_metadata(content):
+    """Parse the launcher-relevant fields of a .mod file. Missing fields are empty."""
+    meta = {"name": "", "dependencies": [], "user_dir": "", "github": "", "version": "", "path": ""}
+    for line in content.splitlines():
+        parsed = _parse_mod_kv(line)
+        if not parsed:
+            continue
+        key, value = parsed
+
+        if key == "dependencies":
+            deps_str = value.strip().strip("{}")
+            meta["dependencies"] = [dep.strip().strip('"') for dep in deps_str.split(",") if dep.strip()]
+        elif key in meta:
+            meta[key] = value
+    return meta
+
+
+def _scan_mod_folder(mod_folder, old_cache):
+    """Read every .mod file in mod_folder, reusing old_cache entries for unchanged files.
+
+    Runs on a worker thread, so it only reads its arguments and returns fresh dicts.
+    """
+    mod_files = {}
+    mod_dependencies = {}
+    mod_user_dirs = {}
+    mod_has_em = {}  # {mod_name: bool}, so start_game needs no stat calls
+
+    mod_cache = {}  # Rebuilt from scratch so entries for deleted files drop out
+    cache_changed = False
+    with os.scandir(mod_folder) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".mod") or not entry.is_file():
+                continue
+            try:
+                st = entry.stat()
+                cached = old_cache.get(entry.path)
+                if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                    meta = cached[2]
+                else:
+                    with open(entry.path, 'rb') as mod_file:
+                        meta = _parse_mod_metadata(mod_file.read().decode('utf-8', 'ignore'))
+                    cache_changed = True
+                mod_cache[entry.path] = [st.st_mtime_ns, st.st_size, meta]
+
+                name = meta["name"]
+                if name:
+                    mod_path = meta["path"]
+                    # Path is typically "mod/FolderName" -> folder name is after "mod/"
+                    mod_folder_name = mod_path.split("/")[-1] if mod_path else ""
+                    mod_files[name] = {
+                        'file': entry.name,
+                        'path': mod_path,
+                        'folder': mod_folder_name,
+                        'github': meta["github"] or None,
+                        'version': meta["version"] or None
+                    }
+                    mod_dependencies[name] = meta["dependencies"]
+                    mod_user_dirs[name] = meta["user_dir"]
+                    mod_has_em[name] = bool(mod_folder_name) and os.path.isfile(
+                        os.path.join(mod_folder, mod_folder_name, "common", EVENT_MODIFIERS_FILE)
+                    )
+            except Exception as e:
+                print(f"An error reading the mod file {entry.name}: {e}")
+
+    return {
+        "mod_files": mod_files,
+        "mod_dependencies": mod_dependencies,
+        "mod_user_dirs": mod_user_dirs,
+        "mod_has_em": mod_has_em,
+        "mod_cache": mod_cache,
+        "cache_changed": cache_changed or mod_cache.keys() != old_cache.keys(),
+    }
+
+
+class _ModScanSignals(QObject):
+    finished = pyqtSignal(int, object)  # (scan id, _scan_mod_folder result or None on error)
+
+
+class _ModScanWorker(QRunnable):
+    """Runs _scan_mod_folder on the global thread pool and reports back through signals."""
+
+    def __init__(self, scan_id, mod_folder, mod_cache):
+        super().__init__()
+        self.signals = _ModScanSignals()
+        self._scan_id = scan_id
+        self._mod_folder = mod_folder
+        self._mod_cache = mod_cache
+
+    def run(self):
+        result = None
+        try:
+            result = _scan_mod_folder(self._mod_folder, self._mod_cache)
+        except Exception as e:
+            print(f"Error scanning the mod folder {self._mod_folder}: {e}")
+        finally:
+            self.signals.finished.emit(self._scan_id, result)
 
 
 class GameLauncher(QWidget):
@@ -32,6 +167,26 @@ class GameLauncher(QWidget):
 
         self.mod_files = {}  # Dictionary to store {display_name: filename}
         self.mod_dependencies = {}  # Dictionary to store {mod_name: [dependencies]}
+        self._mod_items = {}  # {mod_name: QTreeWidgetItem} in tree (load) order
+        self._checked = set()  # Names of checked mods, kept in step by on_item_changed
+
+        # Dialog classes, imported on first use to keep their modules (and requests) out of startup
+        self._ConfigDialog = None
+        self._PresetManagerDialog = None
+        self._UpdateCheckerDialog = None
+        self._mod_order_stale = False
+        self._mod_has_em = {}
+        self._mod_cache = {}  # {.mod path: [st_mtime_ns, st_size, parsed metadata]}
+        self._mod_names_sorted = ()  # a-z, kept in step with mod_files
+        self._mod_scan_id = 0  # Only the result of the latest background scan is applied
+        self._mods_loaded_callbacks = []
+        self.user_dir = ""
+
+        # Coalesces bursts of checkbox changes into a single settings write
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(150)
+        self._save_timer.timeout.connect(self._do_save_checked_mods)
         
         # Get the directory of the running executable
         application_path = os.path.dirname(sys.argv[0])
@@ -63,21 +218,31 @@ class GameLauncher(QWidget):
 
         self._save_game_root_to_settings(self.game_root)
         self.config_file = "launcher_configs.json"
-        self.settings_file = os.path.join(self.game_root, "mod", self.config_file)
+        self.settings_file = os.path.join(self.mod_folder, self.config_file)
         if not os.path.exists(self.settings_file):
-            with open(self.settings_file, "w", encoding="utf-8") as file:
-                json.dump({
-                    "checked_mods": [],
-                    "game_root": self.game_root,
-                    "update_time": 1,
-                    "realtime": 0,
-                    "skipintro": 0,
-                    "presets": {},
-                    "merge_event_modifiers": 1
-                }, file, indent=4)
+            _write_json(self.settings_file, {
+                "checked_mods": [],
+                "game_root": self.game_root,
+                "update_time": 1,
+                "realtime": 0,
+                "skipintro": 0,
+                "presets": {},
+                "merge_event_modifiers": 1
+            })
         self.initUI()
-        self.load_mods()
-        self.loadSettings()
+        self.loadSettings()  # Also builds the mod tree
+
+    @property
+    def game_root(self):
+        return self._game_root
+
+    @game_root.setter
+    def game_root(self, root):
+        # mod_folder/z_launcher_dir follow game_root, including when the settings dialog changes it
+        self._game_root = root
+        self.mod_folder = os.path.join(root, "mod") if root else None
+        self.z_launcher_dir = os.path.join(self.mod_folder, Z_LAUNCHER_NAME) if root else None
+        self._z_launcher_ready = False
 
     def _game_root_has_executable(self, path):
         """Return True if path contains v2game.exe."""
@@ -88,8 +253,7 @@ class GameLauncher(QWidget):
         if not os.path.exists(self._bootstrap_config_path):
             return None
         try:
-            with open(self._bootstrap_config_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = _read_json(self._bootstrap_config_path)
             return data.get("game_root") or None
         except Exception:
             return None
@@ -100,13 +264,11 @@ class GameLauncher(QWidget):
             data = {}
             if os.path.exists(self._bootstrap_config_path):
                 try:
-                    with open(self._bootstrap_config_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    data = _read_json(self._bootstrap_config_path)
                 except Exception:
                     pass
             data["game_root"] = game_root
-            with open(self._bootstrap_config_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4)
+            _write_json(self._bootstrap_config_path, data)
         except Exception:
             pass
 
@@ -131,6 +293,10 @@ class GameLauncher(QWidget):
         return None, False
 
     def _get_available_drives(self):
+        if sys.platform == "win32":
+            # One call returns a bitmask of drive letters without touching (or waking) the drives
+            mask = ctypes.windll.kernel32.GetLogicalDrives()
+            return [f"{letter}:\\" for i, letter in enumerate(string.ascii_uppercase) if mask & (1 << i)]
         drives = []
         for letter in string.ascii_uppercase:
             drive = f"{letter}:\\"
@@ -169,6 +335,7 @@ class GameLauncher(QWidget):
         self.mod_tree.setHeaderLabels(['Mods'])
         self.mod_tree.setDragDropMode(QTreeWidget.DragDropMode.InternalMove)
         self.mod_tree.itemChanged.connect(self.on_item_changed)
+        self.mod_tree.model().rowsInserted.connect(self._on_mod_rows_inserted)
 
         # Top bar with mod-folder + refresh icons
         top_bar = QHBoxLayout()
@@ -249,17 +416,12 @@ class GameLauncher(QWidget):
         except Exception:
             checked = []
 
-        self.load_mods()
-
-        try:
-            self.set_checked_mods(checked)
-        except Exception:
-            pass
+        self.load_mods(on_loaded=lambda: self.set_checked_mods(checked))
 
     def open_mod_folder(self):
         """Open the Victoria 2 mod directory in the system file explorer."""
         try:
-            mod_folder = os.path.join(self.game_root, "mod")
+            mod_folder = self.mod_folder
             if not os.path.isdir(mod_folder):
                 QMessageBox.warning(self, "Mod folder not found", f"Could not find mod folder:\n{mod_folder}")
                 return
@@ -268,12 +430,10 @@ class GameLauncher(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to open mod folder: {e}")
 
-    def _get_mod_folder(self):
-        """Return the Victoria 2 mod directory path."""
-        return os.path.join(self.game_root, "mod")
-
     def _ensure_z_launcher_setup(self, mod_folder):
         """Create z_launcher folder, .mod file, common/event_modifiers.txt, and readme. Idempotent."""
+        if self._z_launcher_ready:
+            return  # Already checked this session for the current game_root
         z_dir = os.path.join(mod_folder, Z_LAUNCHER_NAME)
         common_dir = os.path.join(z_dir, "common")
         os.makedirs(common_dir, exist_ok=True)
@@ -291,20 +451,11 @@ class GameLauncher(QWidget):
         if not os.path.exists(readme_path):
             with open(readme_path, "w", encoding="utf-8") as f:
                 f.write("This folder and mod is used to fix conflicts with event_modifiers and is hidden by default.\n")
+        self._z_launcher_ready = True
 
-    def _get_mods_with_event_modifiers(self, selected_mods, mod_folder):
-        """Return list of selected mod names that have common/event_modifiers.txt."""
-        result = []
-        for mod_name in selected_mods:
-            if mod_name not in self.mod_files:
-                continue
-            folder = self.mod_files[mod_name].get("folder")
-            if not folder:
-                continue
-            path = os.path.join(mod_folder, folder, "common", EVENT_MODIFIERS_FILE)
-            if os.path.isfile(path):
-                result.append(mod_name)
-        return result
+    def _get_mods_with_event_modifiers(self, selected_mods):
+        """Return list of selected mod names that have common/event_modifiers.txt (as found by load_mods)."""
+        return [mod_name for mod_name in selected_mods if self._mod_has_em.get(mod_name)]
 
     def _resolve_event_modifiers_load_order(self, mod_names):
         """
@@ -314,33 +465,20 @@ class GameLauncher(QWidget):
         """
         if not mod_names:
             return []
-        # Build graph: dep -> mod for each (mod depends on dep) so dep must come before mod
-        deps_map = {}
-        for mod in mod_names:
-            deps_map[mod] = [d for d in self.mod_dependencies.get(mod, []) if d in mod_names]
-        # Topological sort (Kahn). If cycle, fall back to sorted.
-        in_degree = {m: 0 for m in mod_names}
-        for mod in mod_names:
-            for dep in deps_map[mod]:
-                in_degree[mod] += 1
-        queue = deque(m for m in mod_names if in_degree[m] == 0)
-        order = []
-        # Reverse deps_map for "who depends on me"
-        rev = {m: [] for m in mod_names}
-        for mod in mod_names:
-            for dep in deps_map[mod]:
-                rev[dep].append(mod)
-        while queue:
-            m = queue.popleft()
-            order.append(m)
-            for other in rev[m]:
-                in_degree[other] -= 1
-                if in_degree[other] == 0:
-                    queue.append(other)
-        if len(order) != len(mod_names):
+        mod_names_set = set(mod_names)
+        # Filter the a-z order computed at load time rather than sorting again
+        mod_names_sorted = [n for n in self._mod_names_sorted if n in mod_names_set]
+        sorter = TopologicalSorter()
+        # Register every node first so ties come out in a-z order
+        for mod in mod_names_sorted:
+            sorter.add(mod)
+        for mod in mod_names_sorted:
+            sorter.add(mod, *[d for d in self.mod_dependencies.get(mod, []) if d in mod_names_set])
+        try:
+            return list(sorter.static_order())
+        except CycleError:
             print("Event modifiers load order: dependency cycle or missing dependency detected. Using alphanumeric order.")
-            return sorted(mod_names)
-        return order
+            return mod_names_sorted
 
     def _parse_event_modifiers_content(self, content):
         """
@@ -348,81 +486,112 @@ class GameLauncher(QWidget):
         if they contain { ; keep reading until matching }.
         Returns list of (key, value) in order; value may contain newlines.
         """
+        # Leading "\n" lets the pattern anchor every line on a literal newline
+        content = "\n" + content
         pairs = []
-        lines = content.splitlines()
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            s = line.strip()
-            if not s or s.startswith("#"):
-                i += 1
-                continue
-            if "=" not in s:
-                i += 1
-                continue
-            key, value = s.split("=", 1)
-            key = key.strip()
-            value = value.strip()
+        pos = 0
+        search = _EM_PAIR_RE.search
+        while (m := search(content, pos)) is not None:
+            value = m.group(2).strip()
+            pos = m.end()
             if "{" in value:
+                # Jump from one closing brace to the next; the block ends at the
+                # end of the first line where the brace depth is back to zero.
                 depth = value.count("{") - value.count("}")
-                while depth > 0 and i + 1 < len(lines):
-                    i += 1
-                    next_line = lines[i]
-                    value += "\n" + next_line
-                    depth += next_line.count("{") - next_line.count("}")
-                value = value.strip()
-            pairs.append((key, value))
-            i += 1
+                end = pos
+                while depth > 0:
+                    close = content.find("}", end)
+                    if close == -1:
+                        end = len(content)
+                        break
+                    depth += content.count("{", end, close) - 1
+                    end = close + 1
+                    if depth <= 0:
+                        eol = content.find("\n", end)
+                        if eol == -1:
+                            eol = len(content)
+                        depth += content.count("{", end, eol) - content.count("}", end, eol)
+                        end = eol
+                if end != pos:
+                    value = (value + content[pos:end]).strip()
+                    pos = end
+            pairs.append((m.group(1).rstrip(), value))
         return pairs
 
-    def _merge_event_modifiers_from_paths(self, mod_folder, ordered_mod_names):
+    def _read_and_parse_event_modifiers(self, path):
+        """Return the (key, value) pairs of one event_modifiers.txt, or [] if it can't be read."""
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read()
+        except Exception as e:
+            print(f"Could not read {path}: {e}")
+            return []
+        return self._parse_event_modifiers_content(content)
+
+    def _merge_event_modifiers_to_file(self, mod_folder, ordered_mod_names, out_path):
         """
-        Merge event_modifiers from the given mods in load order into z_launcher's file.
+        Merge event_modifiers from the given mods in load order into out_path (z_launcher's file).
         First mod's content is used as base; then for each next: same key+value skip,
         same key different value overwrite (later mod wins), new key append to bottom.
         """
-        merged_values = {}  # key -> value (last writer wins)
-        merged_order = []   # keys in order of first appearance
-        for mod_name in ordered_mod_names:
-            folder = self.mod_files[mod_name]["folder"]
-            path = os.path.join(mod_folder, folder, "common", EVENT_MODIFIERS_FILE)
-            try:
-                with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-            except Exception as e:
-                print(f"Could not read {path}: {e}")
-                continue
-            for key, value in self._parse_event_modifiers_content(content):
-                merged_values[key] = value
-                if key not in merged_order:
-                    merged_order.append(key)
-        output_lines = []
-        for key in merged_order:
-            val = merged_values[key]
-            output_lines.append(f"{key}={val}\n")
-        return "".join(output_lines)
+        paths = [
+            os.path.join(mod_folder, self.mod_files[mod_name]["folder"], "common", EVENT_MODIFIERS_FILE)
+            for mod_name in ordered_mod_names
+        ]
+        # Files are independent, so read and parse them concurrently; map() keeps load order
+        with ThreadPoolExecutor(max_workers=min(8, len(paths) or 1)) as pool:
+            parsed = list(pool.map(self._read_and_parse_event_modifiers, paths))
+
+        # key -> value; later mods overwrite the value but dicts keep first-appearance order
+        merged_values = {}
+        for pairs in parsed:
+            merged_values.update(pairs)
+        # Stream pairs through the buffered writer instead of building one big string
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.writelines(f"{key}={value}\n" for key, value in merged_values.items())
+
+    def _on_mod_rows_inserted(self, *args):
+        # Drag and drop re-inserts items, which changes the load order
+        self._mod_order_stale = True
+
+    def _refresh_mod_item_order(self):
+        """Walk the tree once and rebuild the {mod_name: item} cache (in tree order) and the checked set."""
+        mod_items = {}
+        checked = set()
+        iterator = QTreeWidgetItemIterator(self.mod_tree, QTreeWidgetItemIterator.IteratorFlag.All)
+        while iterator.value():
+            item = iterator.value()
+            mod_items[item.text(0)] = item
+            if item.checkState(0) == Qt.CheckState.Checked:
+                checked.add(item.text(0))
+            iterator += 1
+        self._mod_items = mod_items
+        self._checked = checked
+        self._mod_order_stale = False
 
     def set_checked_mods(self, checked_mods):
         """Set the checked state of mods in the tree based on the provided list."""
         try:
-            iterator = QTreeWidgetItemIterator(self.mod_tree, QTreeWidgetItemIterator.IteratorFlag.All)
+            checked_mods = set(checked_mods)
             self.mod_tree.blockSignals(True)  # Prevent signals during setup
-            while iterator.value():
-                item = iterator.value()
-                mod_name = item.text(0)
-                if mod_name in checked_mods:
-                    item.setCheckState(0, Qt.CheckState.Checked)
-                else:
-                    item.setCheckState(0, Qt.CheckState.Unchecked)
-                iterator += 1
+            for mod_name, item in self._mod_items.items():
+                desired = Qt.CheckState.Checked if mod_name in checked_mods else Qt.CheckState.Unchecked
+                if item.checkState(0) != desired:
+                    item.setCheckState(0, desired)
             self.mod_tree.blockSignals(False)  # Re-enable signals
+            self._checked = checked_mods & self._mod_items.keys()
         except Exception as e:
             QMessageBox.warning(self, 'Error', f"Error occurred when setting checked mods: {e}")
 
     def preset_manager(self):
         """Opens the preset manager dialog."""
         try:
-            dialog = PresetManagerDialog(self.get_checked_mods(), self.settings_file, parent=self)
+            self._flush_checked_mods_save()
+            self._flush_settings_writes()  # The preset dialog reads and rewrites the whole file
+            if self._PresetManagerDialog is None:
+                from scr.presetmanagerWindow import PresetManagerDialog
+                self._PresetManagerDialog = PresetManagerDialog
+            dialog = self._PresetManagerDialog(self.get_checked_mods(), self.settings_file, parent=self)
             
             if dialog.exec():
                 self.checked_mods = dialog.checked_mods
@@ -473,90 +642,94 @@ class GameLauncher(QWidget):
             QMessageBox.warning(self, "Error", f"Error occurred trying to open the about tab: {e}")
 
     def check_for_updates(self):
-        dialog = UpdateCheckerDialog(self.mod_files, os.path.join(self.game_root, "mod"))
+        if self._UpdateCheckerDialog is None:
+            from scr.updatesWindow import UpdateCheckerDialog
+            self._UpdateCheckerDialog = UpdateCheckerDialog
+        dialog = self._UpdateCheckerDialog(self.mod_files, self.mod_folder)
         dialog.exec()
 
     def open_config_dialog(self):
         """Opens the configuration dialog."""
         try:
-            dialog = ConfigDialog(self.game_root, self, self.user_dir)
+            self._flush_checked_mods_save()
+            if self._ConfigDialog is None:
+                from scr.configWindow import ConfigDialog
+                self._ConfigDialog = ConfigDialog
+            self._flush_settings_writes()  # The dialog reads both files; a queued write (e.g. Clear Cache) must land first
+            dialog = self._ConfigDialog(self.game_root, self, self.user_dir)
             dialog.exec()
         except Exception as e:
             print(e)
             QMessageBox.warning(self, "Error", f"Error occurred in the configuration tab: {e}")
 
-    def load_mods(self):
-        mod_folder = os.path.join(self.game_root, "mod")
+    def load_mods(self, on_loaded=None):
+        """Rescan the mod folder in the background; the tree is rebuilt and on_loaded called when it is done."""
+        if on_loaded is not None:
+            self._mods_loaded_callbacks.append(on_loaded)
+        self._mod_scan_id += 1
+        mod_folder = self.mod_folder
         
         if not os.path.exists(mod_folder):
             print(f"Mod folder does not exist: {mod_folder}")
             self.mod_tree.clear()
+            self._mod_items = {}
+            self._checked = set()
+            self._set_mods_loading(False)
+            self._run_mods_loaded_callbacks()
             return
 
-        self.mod_files.clear()
-        self.mod_dependencies.clear()
-        self.mod_user_dirs = {}
-
-        def _parse_mod_kv(line: str) -> tuple[str, str] | None:
-            # Supports formats like: key="value" or key = "value"
-            s = (line or "").strip()
-            if not s or s.startswith("#") or s.startswith("//"):
-                return None
-            if "=" not in s:
-                return None
-            key, value = s.split("=", 1)
-            key = key.strip()
-            value = value.strip()
-            if value.startswith('"') and value.endswith('"') and len(value) >= 2:
-                value = value[1:-1]
-            return key, value
-
-        for file in os.listdir(mod_folder):
-            if file.endswith(".mod"):
-                try:
-                    with open(os.path.join(mod_folder, file), 'r', encoding='utf-8', errors='ignore') as mod_file:
-                        content = mod_file.read()
-                        name = ""
-                        dependencies = []
-                        user_dir = ""
-                        github = ""
-                        version = ""
-                        mod_path = ""  # e.g. "mod/ModFolder"
-                        for line in content.split('\n'):
-                            parsed = _parse_mod_kv(line)
-                            if not parsed:
-                                continue
-                            key, value = parsed
-
-                            if key == "name":
-                                name = value
-                            elif key == "dependencies":
-                                deps_str = value.strip().strip("{}")
-                                dependencies = [dep.strip().strip('"') for dep in deps_str.split(",") if dep.strip()]
-                            elif key == "path":
-                                mod_path = value
-                            elif key == "user_dir":
-                                user_dir = value
-                            elif key == "github":
-                                github = value
-                            elif key == "version":
-                                version = value
-
-                        if name:
-                            # Path is typically "mod/FolderName" -> folder name is after "mod/"
-                            mod_folder_name = mod_path.split("/")[-1] if mod_path else ""
-                            self.mod_files[name] = {
-                                'file': file,
-                                'path': mod_path,
-                                'folder': mod_folder_name,
-                                'github': github if github else None,
-                                'version': version if version else None
-                            }
-                            self.mod_dependencies[name] = dependencies
-                            self.mod_user_dirs[name] = user_dir
-                except Exception as e:
-                    print(f"An error reading the mod file {file}: {e}")
+        self._flush_checked_mods_save()  # The tree is emptied below; save the checked mods first
+        self._set_mods_loading(True)
+        worker = _ModScanWorker(self._mod_scan_id, mod_folder, self._mod_cache)
+        worker.signals.finished.connect(self._on_mods_scanned)
+        QThreadPool.globalInstance().start(worker)
+
+    def _set_mods_loading(self, loading):
+        """Show a placeholder row and disable the buttons that need the mod list while a scan runs."""
+        if loading:
+            self.mod_tree.blockSignals(True)
+            self.mod_tree.clear()
+            placeholder = QTreeWidgetItem(["Loading…"])
+            placeholder.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.mod_tree.addTopLevelItem(placeholder)
+            self.mod_tree.blockSignals(False)
+            self._mod_items = {}
+            self._checked = set()
+            self._mod_order_stale = False
+        for button in (self.start_button, self.refresh_mods_button, self.preset_manager_button,
+                       self.config_button, self.update_button):
+            button.setEnabled(not loading)
+
+    def _on_mods_scanned(self, scan_id, result):
+        if scan_id != self._mod_scan_id:
+            return  # A newer scan is running; its result replaces this one
+        if result is not None:
+            # Updated in place; dialogs may hold a reference to mod_files
+            self.mod_files.clear()
+            self.mod_files.update(result["mod_files"])
+            self.mod_dependencies.clear()
+            self.mod_dependencies.update(result["mod_dependencies"])
+            self._mod_names_sorted = tuple(sorted(self.mod_files))
+            self.mod_user_dirs = result["mod_user_dirs"]
+            self._mod_has_em = result["mod_has_em"]
+            if result["cache_changed"]:
+                self._mod_cache = result["mod_cache"]
+                self._save_mod_cache()
+
+        self._populate_mod_tree()
+        self._set_mods_loading(False)
+        self._run_mods_loaded_callbacks()
+
+    def _run_mods_loaded_callbacks(self):
+        callbacks, self._mods_loaded_callbacks = self._mods_loaded_callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error after loading mods: {e}")
 
+    def _populate_mod_tree(self):
+        self.mod_tree.setUpdatesEnabled(False)
         self.mod_tree.blockSignals(True)
         self.mod_tree.clear()
         mod_items = {}
@@ -587,21 +760,31 @@ class GameLauncher(QWidget):
 
         self.mod_tree.expandAll()
         self.mod_tree.blockSignals(False)
+        self.mod_tree.setUpdatesEnabled(True)
+        self._refresh_mod_item_order()
+
+    def _save_mod_cache(self):
+        """Persist parsed .mod metadata so the next launch can skip unchanged files."""
+        try:
+            self._flush_settings_writes()  # Otherwise a queued config write could replace the file mid-update
+            settings = _read_json(self.settings_file) if os.path.exists(self.settings_file) else {}
+            settings["mod_cache"] = self._mod_cache
+            _write_json(self.settings_file, settings)
+        except Exception as e:
+            print(f"Error saving the mod cache: {e}")
 
     def get_checked_mods(self):
         checked_mods = []
         last_user_dir_mod = None
         try:
-            iterator = QTreeWidgetItemIterator(self.mod_tree, QTreeWidgetItemIterator.IteratorFlag.All)
-            while iterator.value():
-                item = iterator.value()
-                if item.checkState(0) == Qt.CheckState.Checked:
-                    mod_name = item.text(0)
-                    if mod_name in self.mod_files:
-                        checked_mods.append(mod_name)
-                        if self.mod_user_dirs[mod_name]:
-                            last_user_dir_mod = mod_name
-                iterator += 1
+            if self._mod_order_stale:
+                self._refresh_mod_item_order()
+            # _mod_items supplies the tree order; _checked avoids asking Qt for every item's state
+            for mod_name in self._mod_items:
+                if mod_name in self._checked and mod_name in self.mod_files:
+                    checked_mods.append(mod_name)
+                    if self.mod_user_dirs[mod_name]:
+                        last_user_dir_mod = mod_name
             if last_user_dir_mod:
                 self.user_dir = self.mod_user_dirs[last_user_dir_mod]
                 print(f"User directory: {self.user_dir}")
@@ -612,11 +795,17 @@ class GameLauncher(QWidget):
 
         return checked_mods
 
+    def _flush_settings_writes(self):
+        """Wait for the config dialog's queued writes; call before reading launcher_configs.json."""
+        if self._ConfigDialog is not None:  # Nothing else queues writes
+            from scr.configWindow import flush_pending_writes
+            flush_pending_writes()
+
     def start_game(self):
+        self._flush_settings_writes()  # Settings saved from the config dialog must be on disk first
         selected_mods = self.get_checked_mods()
 
-        with open(self.settings_file, "r", encoding="utf-8") as file:
-            launcher_config = json.load(file)
+        launcher_config = _read_json(self.settings_file)
 
         settings_path = os.path.join(
             os.path.expanduser("~"),
@@ -628,62 +817,55 @@ class GameLauncher(QWidget):
         )
 
         with open(settings_path, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-
-        with open(settings_path, "w", encoding="utf-8") as file:
-            for i in range(len(lines)):
-                if lines[i].startswith("update_time"):
-                    lines[i] = f"update_time={float(launcher_config['update_time']):.6f}\n"
-
-            file.writelines(lines)
+            content = file.read()
+        update_time_line = f"update_time={float(launcher_config['update_time']):.6f}"
+        new_content = _UPDATE_TIME_RE.sub(update_time_line, content)
+        if new_content != content:  # Usually already in sync; skip the rewrite then
+            with open(settings_path, "w", encoding="utf-8") as file:
+                file.write(new_content)
 
         mods_to_load = list(selected_mods)
         merge_event_modifiers = bool(int(launcher_config.get("merge_event_modifiers", 1)))
-        if merge_event_modifiers and selected_mods:
-            mod_folder = self._get_mod_folder()
-            z_launcher_dir = os.path.join(mod_folder, Z_LAUNCHER_NAME)
-            if not os.path.isdir(z_launcher_dir):
-                self._ensure_z_launcher_setup(mod_folder)
-            mods_with_em = self._get_mods_with_event_modifiers(selected_mods, mod_folder)
-            if len(mods_with_em) > 1:
-                t0 = time.perf_counter()
-                order = self._resolve_event_modifiers_load_order(mods_with_em)
-                merged_content = self._merge_event_modifiers_from_paths(mod_folder, order)
-                z_launcher_common = os.path.join(mod_folder, Z_LAUNCHER_NAME, "common", EVENT_MODIFIERS_FILE)
-                with open(z_launcher_common, "w", encoding="utf-8") as f:
-                    f.write(merged_content)
-                mods_to_load.append(Z_LAUNCHER_NAME)
-                elapsed = time.perf_counter() - t0
-                print(f"Event modifiers merge completed in {elapsed:.3f}s")
-
+        # A merge needs at least two mods shipping the file; touch z_launcher only then
+        mods_with_em = self._get_mods_with_event_modifiers(selected_mods) if merge_event_modifiers else []
+        if len(mods_with_em) > 1:
+            mod_folder = self.mod_folder
+            self._ensure_z_launcher_setup(mod_folder)
+            t0 = time.perf_counter()
+            order = self._resolve_event_modifiers_load_order(mods_with_em)
+            z_launcher_common = os.path.join(self.z_launcher_dir, "common", EVENT_MODIFIERS_FILE)
+            self._merge_event_modifiers_to_file(mod_folder, order, z_launcher_common)
+            mods_to_load.append(Z_LAUNCHER_NAME)
+            elapsed = time.perf_counter() - t0
+            print(f"Event modifiers merge completed in {elapsed:.3f}s")
+
+        game_args = [os.path.join(self.game_root, "v2game.exe")]
         if mods_to_load:
-            mod_file_args = []
             for mod in mods_to_load:
                 if mod == Z_LAUNCHER_NAME:
-                    mod_file_args.append("-mod=mod/z_launcher.mod")
+                    game_args.append("-mod=mod/z_launcher.mod")
                 else:
-                    mod_file_args.append(f"-mod=mod/{self.mod_files[mod]['file']}")
-            mods_argument = " ".join(mod_file_args)
-            game_command = f'v2game.exe {mods_argument}'
-            print(f"Starting game with mods: {game_command}")
+                    game_args.append(f"-mod=mod/{self.mod_files[mod]['file']}")
+            print(f"Starting game with mods: {game_args}")
         else:
-            game_command = 'v2game.exe'
             print("Starting game without mods.")
 
-        priority = "realtime" if str(launcher_config.get("realtime", 0)) == "1" else "high"
-        full_command = (
-            f'cd /d "{self.game_root}" && '
-            f'start "Victoria II" /{priority} /affinity 1 /node 0 '
-            f'{game_command}'
-        )
-
-        print(full_command)
+        realtime = str(launcher_config.get("realtime", 0)) == "1"
+        priority_class = subprocess.REALTIME_PRIORITY_CLASS if realtime else subprocess.HIGH_PRIORITY_CLASS
 
         try:
-            thread = threading.Thread(target=subprocess.run, args=(full_command,), kwargs={'shell': True})
-            thread.start()
+            # Spawn the game directly rather than through cmd.exe's "start"; Popen returns immediately
+            process = subprocess.Popen(
+                game_args,
+                cwd=self.game_root,
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP | priority_class,
+                close_fds=True,
+            )
+            # Pin to the first CPU, as "start /affinity 1" did
+            ctypes.windll.kernel32.SetProcessAffinityMask(ctypes.c_void_p(int(process._handle)), ctypes.c_size_t(1))
             if selected_mods:
-                self.save_checked_mods()
+                self._save_timer.stop()
+                self._do_save_checked_mods()
             self.close()
         except Exception as e:
             QMessageBox.warning(self, 'Error', f"An error occurred when starting the game: {e}")
@@ -692,56 +874,76 @@ class GameLauncher(QWidget):
     def on_item_changed(self, item, column):
         if column == 0:
             try:
-                check_state = item.checkState(0)
+                if item.checkState(0) == Qt.CheckState.Checked:
+                    self._checked.add(item.text(0))
+                else:
+                    self._checked.discard(item.text(0))
                 self.mod_tree.blockSignals(True)
                 self.save_checked_mods()
                 self.mod_tree.blockSignals(False)
             except Exception as e:
                 QMessageBox.warning(self, 'Error', f"An error occurred when changing the mod state: {e}")
     def loadSettings(self):
+        """Read the launcher config, load the mods and restore their checked state. Called once at startup."""
         checked_mods = []
         
         try:
             if os.path.exists(self.settings_file):
-                with open(self.settings_file, "r", encoding="utf-8") as f:
-                    settings = json.load(f)
-                    checked_mods = settings.get("checked_mods", [])
-                    self.game_root = settings.get('game_root', self.game_root)
+                settings = _read_json(self.settings_file)
+                checked_mods = settings.get("checked_mods", [])
+                self.game_root = settings.get('game_root', self.game_root)
+                self._mod_cache = settings.get("mod_cache", {})
         except Exception as e:
             QMessageBox.warning(self, 'Error', f"Error loading settings: {e}")
         
-        self.load_mods()
-        
-        iterator = QTreeWidgetItemIterator(self.mod_tree, QTreeWidgetItemIterator.IteratorFlag.All)
+        self.load_mods(on_loaded=lambda: self._restore_checked_mods(checked_mods))
+
+    def _restore_checked_mods(self, checked_mods):
+        checked_set = set(checked_mods)
+        user_dir = ""  # From the last checked mod (in tree order) that sets one, as get_checked_mods does
+        # _mod_items was just rebuilt with the tree, so no iterator walk is needed
+        self.mod_tree.setUpdatesEnabled(False)
         self.mod_tree.blockSignals(True)
-        while iterator.value():
-            item = iterator.value()
-            mod_name = item.text(0)
-            if mod_name in checked_mods:
-                item.setCheckState(0, Qt.CheckState.Checked)
+        for mod_name, item in self._mod_items.items():
+            if mod_name in checked_set:
+                desired = Qt.CheckState.Checked
+                user_dir = self.mod_user_dirs.get(mod_name) or user_dir
             else:
-                item.setCheckState(0, Qt.CheckState.Unchecked)
-            iterator += 1
+                desired = Qt.CheckState.Unchecked
+            if item.checkState(0) != desired:
+                item.setCheckState(0, desired)
         self.mod_tree.blockSignals(False)
-        
-        try:
-            self.get_checked_mods()
-        except Exception as e:
-            QMessageBox.warning(self, 'Error', f"Error setting user directory: {e}")
+        self.mod_tree.setUpdatesEnabled(True)
+        self._checked = checked_set & self._mod_items.keys()
+        self.user_dir = user_dir
+        if user_dir:
+            print(f"User directory: {user_dir}")
+
+    def closeEvent(self, event):
+        self._flush_checked_mods_save()
+        super().closeEvent(event)
+
+    def _flush_checked_mods_save(self):
+        """Write a pending debounced save now; dialogs that rewrite the settings file must see it."""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._do_save_checked_mods()
 
     def save_checked_mods(self):
+        """Schedule a write of the checked mods; repeated calls within the interval write once."""
+        self._save_timer.start()
+
+    def _do_save_checked_mods(self):
         checked_mods = self.get_checked_mods()
         settings = {}
 
         try:
+            self._flush_settings_writes()
             if os.path.exists(self.settings_file):
-                with open(self.settings_file, "r", encoding="utf-8") as f:
-                    settings = json.load(f)
+                settings = _read_json(self.settings_file)
             settings["checked_mods"] = checked_mods
             settings["game_root"] = self.game_root
-            mod_folder = os.path.join(self.game_root, "mod")
-            os.makedirs(mod_folder, exist_ok=True)
-            with open(self.settings_file, "w", encoding="utf-8") as f:
-                json.dump(settings, f, indent=4)
+            os.makedirs(self.mod_folder, exist_ok=True)
+            _write_json(self.settings_file, settings)
         except Exception as e:
             QMessageBox.warning(self, 'Error', f"Error saving settings: {e}")
@@ -110,6 +110,6 @@ class PresetManagerDialog(QDialog):
         """Saves the presets to the settings file."""
         try:
             with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=4)
+                f.write(json.dumps(self.settings, indent=4))
         except Exception as e:
             print(f"Error saving presets: {e}")
@@ -1,9 +1,14 @@
+import io
 import os
+import json
 import requests
+from requests.adapters import HTTPAdapter
 import re
 import shutil
 import tempfile
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -16,9 +21,35 @@ from PyQt6.QtWidgets import (
     QProgressBar,
 )
 from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal
-from datetime import datetime
+from datetime import datetime, timezone
 import webbrowser
 
+# GitHub API responses kept with their ETag, so unchanged repos cost a 304 (free against the rate limit)
+_ETAG_CACHE_FILE = "launcher_github_cache.json"
+
+_GITHUB_URL_RE = re.compile(r"^https?://github\.com/([^/]+)/([^/#?]+)")
+_VERSION_LINE_RE = re.compile(r"^\s*version\s*=")
+_MOD_PATH_RE = re.compile(r'^\s*path\s*=\s*"?([^"\r\n]*)"?', re.MULTILINE)
+# Top-level repo folders that are never game content, skipped even when no allowlist can be derived
+_REPO_ONLY_DIRS = {"docs", "tests"}
+
+# Update checks still running after their dialog closed; held here until their thread is destroyed
+_live_checks = set()
+
+# Zipballs up to this size are downloaded to memory; larger or unsized ones go to a temp file
+_ZIP_SPOOL_MAX = 64 * 1024 * 1024
+
+
+def _merge_move(src: str, dest: str, src_is_dir: bool) -> None:
+    """Move src onto dest with os.replace, descending into folders that already exist at dest."""
+    if src_is_dir and os.path.isdir(dest):
+        with os.scandir(src) as it:
+            entries = list(it)  # Listed up front since the loop moves entries out of src
+        for entry in entries:
+            _merge_move(entry.path, os.path.join(dest, entry.name), entry.is_dir(follow_symlinks=False))
+    else:
+        os.replace(src, dest)
+
 
 class _UpdateWorker(QObject):
     status = pyqtSignal(str)
@@ -36,14 +67,13 @@ class _UpdateWorker(QObject):
     def run(self):
         try:
             self.status.emit(f"Downloading source for {self._mod_name} {self._latest_tag}...")
-            with tempfile.TemporaryDirectory(prefix="tglauncher_mod_update_") as td:
-                zip_path = os.path.join(td, "release.zip")
-                self._dialog._download_to_file(self._zipball_url, zip_path)
-
-                self.status.emit(f"Extracting {self._mod_name} {self._latest_tag}...")
-                with zipfile.ZipFile(zip_path, "r") as zf:
-                    root = self._dialog._get_zip_root_folder(zf)
-                    zf.extractall(td)
+            # Extract inside the mod folder so installing is a rename on the same drive, not a copy
+            with tempfile.TemporaryDirectory(prefix="tglauncher_mod_update_", dir=self._dialog.mod_folder) as td:
+                with self._dialog._download_zip(self._zipball_url) as buf:
+                    self.status.emit(f"Extracting {self._mod_name} {self._latest_tag}...")
+                    with zipfile.ZipFile(buf, "r") as zf:
+                        root = self._dialog._get_zip_root_folder(zf)
+                        zf.extractall(td, members=self._dialog._members_to_extract(zf, root))
 
                 extracted_root = os.path.join(td, root)
                 if not os.path.isdir(extracted_root):
@@ -64,11 +94,47 @@ class _UpdateWorker(QObject):
             self.finished.emit()
 
 
+class _CheckWorker(QObject):
+    error = pyqtSignal(str)
+    finished = pyqtSignal(object)  # list of updates, or None when cancelled
+
+    def __init__(self, dialog: "UpdateCheckerDialog", mods: list):
+        super().__init__()
+        self._dialog = dialog
+        self._mods = mods
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        mods_with_updates = None
+        try:
+            mods_with_updates = self._dialog._find_updates(self._mods, self._cancelled, self.error.emit)
+        except Exception as e:
+            self.error.emit(f"An error occurred while checking for updates: {e}")
+        finally:
+            self.finished.emit(mods_with_updates)
+
+
 class UpdateCheckerDialog(QDialog):
     def __init__(self, mod_files, mod_folder, parent=None):
         super().__init__(parent)
         self.mod_files = mod_files
         self.mod_folder = mod_folder
+        # Shared by the check threads and the download so connections are kept alive
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        self._session.headers.update({"User-Agent": "TGLauncher", "Accept": "application/vnd.github+json"})
+        token = self._github_token()
+        if token:
+            # Raises the API limit from 60 to 5000 requests an hour
+            self._session.headers["Authorization"] = f"Bearer {token}"
+        self._etag_cache_path = os.path.join(mod_folder, _ETAG_CACHE_FILE)
+        self._etag_cache = self._load_etag_cache()  # {url: {"etag": str, "body": json}}
+        self._etag_cache_dirty = False
+        self._check_thread = None
+        self._check_worker = None
         # row -> {"mod_name","github_url","release_info","zipball_url","latest_tag"}
         self._updates_by_row = {}
         self.init_ui()
@@ -130,51 +196,135 @@ class UpdateCheckerDialog(QDialog):
         self.mod_list.setEnabled(not busy)
 
     def _repo_from_github_url(self, github_url: str) -> str | None:
-        m = re.match(r"^https?://github\.com/([^/]+)/([^/#?]+)", (github_url or "").strip())
+        m = _GITHUB_URL_RE.match((github_url or "").strip())
         if not m:
             return None
         return f"{m.group(1)}/{m.group(2)}"
 
+    def _github_token(self) -> str | None:
+        """GITHUB_TOKEN from the environment, else "github_token" in launcher_configs.json."""
+        token = os.environ.get("GITHUB_TOKEN")
+        if token:
+            return token.strip()
+        try:
+            with open(os.path.join(self.mod_folder, "launcher_configs.json"), "r", encoding="utf-8") as f:
+                return (json.load(f).get("github_token") or "").strip() or None
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _load_etag_cache(self) -> dict:
+        try:
+            with open(self._etag_cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_etag_cache(self) -> None:
+        try:
+            with open(self._etag_cache_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self._etag_cache))
+            self._etag_cache_dirty = False
+        except OSError as e:
+            print(f"Error saving the GitHub cache: {e}")
+
     def _api_json(self, url: str):
-        resp = requests.get(url, headers={"User-Agent": "TGLauncher"}, timeout=25)
+        cached = self._etag_cache.get(url)
+        headers = {"If-None-Match": cached["etag"]} if cached else None
+        resp = self._session.get(url, headers=headers, timeout=25)
+        if resp.status_code == 304:
+            return cached["body"]
         if resp.status_code != 200:
             return None
-        return resp.json()
-
-    def _download_to_file(self, url: str, out_path: str) -> None:
-        with requests.get(url, headers={"User-Agent": "TGLauncher"}, stream=True, timeout=90) as r:
-            r.raise_for_status()
-            with open(out_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=1024 * 256):
-                    if chunk:
-                        f.write(chunk)
+        body = resp.json()
+        etag = resp.headers.get("ETag")
+        if etag:
+            self._etag_cache[url] = {"etag": etag, "body": body}
+            self._etag_cache_dirty = True
+        return body
+
+    def _download_zip(self, url: str):
+        """Download url into memory or a temp file, rewound and ready for zipfile. The caller closes it."""
+        # Not SpooledTemporaryFile: before Python 3.11 it lacks seekable(), which zipfile needs
+        buf = None
+        try:
+            with self._session.get(url, stream=True, timeout=90) as r:
+                r.raise_for_status()
+                size = r.headers.get("Content-Length", "")
+                buf = io.BytesIO() if size.isdigit() and int(size) <= _ZIP_SPOOL_MAX else tempfile.TemporaryFile()
+                r.raw.decode_content = True  # iter_content did this for us; reading raw needs it set
+                shutil.copyfileobj(r.raw, buf, length=1024 * 1024)
+        except BaseException:
+            if buf is not None:
+                buf.close()
+            raise
+        buf.seek(0)
+        return buf
 
     def _get_zip_root_folder(self, zf: zipfile.ZipFile) -> str:
-        # GitHub zipballs contain a single root folder like owner-repo-sha/
-        roots = set()
-        for name in zf.namelist():
-            if not name or name.endswith("/") is False and "/" not in name:
-                # ignore any weird top-level file; still compute roots via split
-                pass
-            first = name.split("/", 1)[0]
-            if first:
-                roots.add(first)
+        # GitHub zipballs contain a single root folder like owner-repo-sha/, so the first entry names it
+        names = zf.namelist()
+        root = names[0].split("/", 1)[0] if names else ""
+        prefix = root + "/"
+        if root and all(name == root or name.startswith(prefix) for name in names):
+            return root
+        roots = {name.split("/", 1)[0] for name in names} - {""}
         if len(roots) != 1:
             raise RuntimeError(f"Expected 1 root folder in zip, found: {sorted(roots)}")
         return next(iter(roots))
 
+    def _members_to_extract(self, zf: zipfile.ZipFile, root: str) -> list[zipfile.ZipInfo]:
+        """
+        Pick the entries that matter to the game: top-level .mod files and the folders their
+        path points at, matched case-insensitively as Windows does. If any .mod has no path or
+        points at a folder missing from the archive, extract everything but repo metadata
+        (.git*, .github, docs, tests) rather than install part of it.
+        """
+        prefix = root + "/"
+        infos = zf.infolist()
+        fallback = []
+        for info in infos:
+            top, sep, _ = info.filename[len(prefix):].partition("/")
+            if top.startswith(".") or (sep and top.lower() in _REPO_ONLY_DIRS):
+                continue
+            fallback.append(info)
+        mod_infos = [
+            info for info in infos
+            if "/" not in info.filename[len(prefix):] and info.filename.lower().endswith(".mod")
+        ]
+        if not mod_infos:
+            return fallback
+
+        folders = set()
+        for info in mod_infos:
+            m = _MOD_PATH_RE.search(zf.read(info).decode("utf-8", "ignore"))
+            folder = re.split(r"[/\\]", m.group(1).strip().rstrip("/\\"))[-1] if m else ""
+            if not folder:
+                return fallback
+            folders.add(f"{prefix}{folder}/".lower())
+
+        wanted = tuple(folders)
+        selected = []
+        found = set()
+        for info in infos:
+            name = info.filename.lower()
+            if name.startswith(wanted):
+                selected.append(info)
+                found.add(next(w for w in wanted if name.startswith(w)))
+        if found != folders:
+            return fallback
+        return mod_infos + selected
+
     def _update_mod_version_field(self, mod_file_path: str, new_version: str) -> None:
         try:
             with open(mod_file_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
+                lines = f.read().splitlines(keepends=True)
         except FileNotFoundError:
             return
 
         out = []
         replaced = False
         for line in lines:
-            stripped = line.strip()
-            if stripped.startswith("version") and "=" in stripped:
+            if _VERSION_LINE_RE.match(line):
                 out.append(f'version="{new_version}"\n')
                 replaced = True
             else:
@@ -186,74 +336,144 @@ class UpdateCheckerDialog(QDialog):
             out.append(f'version="{new_version}"\n')
 
         with open(mod_file_path, "w", encoding="utf-8", errors="ignore") as f:
-            f.writelines(out)
+            f.write("".join(out))
 
     def _copy_root_contents_to_mod_folder(self, extracted_root_dir: str) -> list[str]:
         copied_mod_files = []
-        for entry in os.listdir(extracted_root_dir):
-            src_path = os.path.join(extracted_root_dir, entry)
-            dest_path = os.path.join(self.mod_folder, entry)
+        with os.scandir(extracted_root_dir) as it:
+            entries = list(it)  # Listed up front since the loop moves entries out of the folder
+        for entry in entries:
+            src_path = entry.path
+            dest_path = os.path.join(self.mod_folder, entry.name)
 
-            if os.path.isdir(src_path):
+            if entry.is_dir(follow_symlinks=False):
                 # Allow overwrites by merging trees and overwriting conflicts
-                shutil.copytree(src_path, dest_path, dirs_exist_ok=True)
-            elif os.path.isfile(src_path):
+                _merge_move(src_path, dest_path, True)
+            elif entry.is_file(follow_symlinks=False):
                 # allow overwriting files (including .mod)
-                shutil.copy2(src_path, dest_path)
-                if entry.lower().endswith(".mod"):
+                os.replace(src_path, dest_path)
+                if entry.name.lower().endswith(".mod"):
                     copied_mod_files.append(dest_path)
         return copied_mod_files
 
+    def _fetch_mod_update(self, repo: str, version: str | None, cancelled: threading.Event):
+        """Fetch the latest release and commits of a repo. Runs on a pool thread, so no widget access."""
+        if cancelled.is_set():
+            return {}, None
+        latest_release_info = self._api_json(f"https://api.github.com/repos/{repo}/releases/latest") or {}
+        latest_release_tag = latest_release_info.get("tag_name")
+        if latest_release_tag and version and latest_release_tag != version:
+            return latest_release_info, None  # A newer release is enough; skip the commits request
+        if cancelled.is_set():
+            return latest_release_info, None
+        # Only the newest commit is used; per_page=1 also keeps the cached body small
+        latest_commit_info = self._api_json(f"https://api.github.com/repos/{repo}/commits?per_page=1")
+        return latest_release_info, latest_commit_info
+
     def check_for_updates(self):
+        """Start checking the mods on a worker thread; _show_updates fills the list when it is done."""
+        self.status_label.setText("Checking for updates...")
+        self._set_busy(True)
+        self.ok_button.setEnabled(True)  # Closing cancels the check
+
+        # Unparented and self-deleting: after a cancel it may outlive the dialog by a few seconds
+        thread = QThread()
+        # A snapshot, since the launcher updates mod_files in place after a rescan
+        worker = _CheckWorker(self, list(self.mod_files.items()))
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.error.connect(self.status_label.setText)
+        worker.finished.connect(self._on_check_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        live = (thread, worker)
+        _live_checks.add(live)
+        thread.destroyed.connect(lambda: _live_checks.discard(live))
+
+        self._check_thread = thread
+        self._check_worker = worker
+        thread.start()
+
+    def _on_check_finished(self, mods_with_updates):
+        if self._check_worker is None:
+            return  # Stopped by _stop_check; nothing to show
+        self._check_thread = None
+        self._check_worker = None
+        self._set_busy(False)
+        if mods_with_updates is not None:
+            self._show_updates(mods_with_updates)
+
+    def _stop_check(self):
+        if self._check_worker is None:
+            return
+        self._check_worker.cancel()
+        # The worker notices the cancel within a poll interval; don't hold the UI longer than that
+        self._check_thread.wait(500)
+        self._check_thread = None
+        self._check_worker = None
+
+    def reject(self):
+        # Close button, title bar X (via closeEvent) and Esc all end up here
+        self._stop_check()
+        super().reject()
+
+    def _find_updates(self, mods: list, cancelled: threading.Event, report_error) -> list | None:
+        """Check every (mod_name, mod_info) with a GitHub URL. Runs on the check thread; returns None if cancelled."""
         mods_with_updates = []  # [(displayText, githubUrl, modName, releaseInfo, zipballUrl, latestTag)]
-        for mod_name, mod_info in self.mod_files.items():
-            github_url = mod_info.get('github')
-            version = mod_info.get('version')
-            mod_file_path = os.path.join(self.mod_folder, mod_info['file'])
+        checks = []  # [(mod_name, mod_info, repo)]
+        for mod_name, mod_info in mods:
+            repo = self._repo_from_github_url(mod_info.get('github'))
+            if repo:
+                checks.append((mod_name, mod_info, repo))
+
+        # Requests run concurrently; results are handled here in mod order as they come in
+        pool = ThreadPoolExecutor(max_workers=8)
+        try:
+            pending = [(mod_name, mod_info, pool.submit(self._fetch_mod_update, repo, mod_info.get('version'), cancelled)) for mod_name, mod_info, repo in checks]
+            for mod_name, mod_info, future in pending:
+                # Poll instead of blocking in result(), so a cancel is noticed while requests are in flight
+                while not future.done() and not cancelled.wait(0.2):
+                    pass
+                if cancelled.is_set():
+                    break
+                github_url = mod_info.get('github')
+                version = mod_info.get('version')
+                mod_file_path = os.path.join(self.mod_folder, mod_info['file'])
 
-            if github_url:
                 try:
-                    repo = self._repo_from_github_url(github_url)
-                    if not repo:
-                        continue
+                    latest_release_info, latest_commit_info = future.result()
 
                     # Latest release
-                    release_api_url = f"https://api.github.com/repos/{repo}/releases/latest"
-                    latest_release_info = self._api_json(release_api_url) or {}
                     latest_release_tag = latest_release_info.get("tag_name")
                     latest_release_date = latest_release_info.get("published_at")
                     zipball_url = latest_release_info.get("zipball_url")
 
                     # Latest commit (informational)
-                    commit_api_url = f"https://api.github.com/repos/{repo}/commits"
-                    commit_response = requests.get(commit_api_url, headers={"User-Agent": "TGLauncher"}, timeout=25)
                     latest_commit_date = None
-                    if commit_response.status_code == 200:
-                        latest_commit_info = commit_response.json()
+                    if latest_commit_info is not None:
                         latest_commit_date = latest_commit_info[0]['commit']['committer']['date']
 
-                    # Check modification date of local mod file
-                    mod_last_modified_timestamp = os.path.getmtime(mod_file_path)
-                    mod_last_modified_date = datetime.utcfromtimestamp(mod_last_modified_timestamp)
-
                     has_new_release = False
                     has_new_commit = False
+                    # Modification date of the local mod file; only read when a date comparison needs it
+                    mod_last_modified_date = None
                     # Compare release date
                     if latest_release_date:
-                        latest_release_date = datetime.strptime(latest_release_date, "%Y-%m-%dT%H:%M:%SZ")
+                        latest_release_date = datetime.fromisoformat(latest_release_date.replace("Z", "+00:00"))
                         # Prefer tag compare; fallback to timestamp if version missing
-                        if (latest_release_tag and version and latest_release_tag != version) or (not version and latest_release_date > mod_last_modified_date):
+                        if latest_release_tag and version and latest_release_tag != version:
                             has_new_release = True
-                        elif latest_release_tag and not version:
-                            # If local version missing, any tagged release newer than file timestamp counts
-                            if latest_release_date > mod_last_modified_date:
-                                has_new_release = True
+                        elif not version:
+                            mod_last_modified_date = datetime.fromtimestamp(os.path.getmtime(mod_file_path), timezone.utc)
+                            has_new_release = latest_release_date > mod_last_modified_date
                     
                     # Compare commit date
                     if latest_commit_date:
-                        latest_commit_date = datetime.strptime(latest_commit_date, "%Y-%m-%dT%H:%M:%SZ")
-                        if latest_commit_date > mod_last_modified_date:
-                            has_new_commit = True
+                        latest_commit_date = datetime.fromisoformat(latest_commit_date.replace("Z", "+00:00"))
+                        if mod_last_modified_date is None:
+                            mod_last_modified_date = datetime.fromtimestamp(os.path.getmtime(mod_file_path), timezone.utc)
+                        has_new_commit = latest_commit_date > mod_last_modified_date
 
                     if has_new_release and has_new_commit:
                         mods_with_updates.append((f"{mod_name} - New release {latest_release_tag} and new commits available.", github_url, mod_name, latest_release_info, zipball_url, latest_release_tag))
@@ -263,18 +483,31 @@ class UpdateCheckerDialog(QDialog):
                         mods_with_updates.append((f"{mod_name} - New commits available (no new release).", github_url, mod_name, None, None, None))
 
                 except Exception as e:
-                    self.status_label.setText(f"An error occurred while displaying the updates, report it to Wyrm on the discord server: {e}")
+                    report_error(f"An error occurred while displaying the updates, report it to Wyrm on the discord server: {e}")
+        finally:
+            # After a cancel, requests already sent finish on the pool threads; queued ones are dropped
+            pool.shutdown(wait=not cancelled.is_set(), cancel_futures=True)
 
+        if cancelled.is_set():
+            return None
+
+        if self._etag_cache_dirty:
+            self._save_etag_cache()
+        return mods_with_updates
+
+    def _show_updates(self, mods_with_updates: list):
         if mods_with_updates:
+            # One repaint for the whole fill; on_selection_changed below catches up on the signals
+            self.mod_list.setUpdatesEnabled(False)
+            self.mod_list.blockSignals(True)
             try:
                 self.mod_list.clear()
                 self._updates_by_row = {}
-                for update_text, url, mod_name, release_info, zipball_url, latest_tag in mods_with_updates:
+                for row, (update_text, url, mod_name, release_info, zipball_url, latest_tag) in enumerate(mods_with_updates):
                     item = QListWidgetItem(update_text)
                     if url:
                         item.setData(Qt.ItemDataRole.UserRole, url)
                     self.mod_list.addItem(item)
-                    row = self.mod_list.row(item)
                     self._updates_by_row[row] = {
                         "mod_name": mod_name,
                         "github_url": url,
@@ -285,6 +518,9 @@ class UpdateCheckerDialog(QDialog):
                 self.status_label.setText("Updates found. Select a mod to update; double-click opens GitHub.")
             except Exception as e:
                 self.status_label.setText(f"An error occurred while displaying the updates, report it to Wyrm on the discord server: {e}")
+            finally:
+                self.mod_list.blockSignals(False)
+                self.mod_list.setUpdatesEnabled(True)
         else:
             self.status_label.setText("All mods are up to date.")
 
@@ -340,15 +576,15 @@ class UpdateCheckerDialog(QDialog):
         def on_success(msg: str):
             self.status_label.setText(msg)
             QMessageBox.information(self, "Update complete", msg)
-            # Refresh mods + metadata (re-read .mod files) and then refresh this dialog list
-            parent = self.parent()
-            if parent is not None and hasattr(parent, "load_mods"):
-                try:
-                    parent.load_mods()
-                except Exception:
-                    pass
-            self.mod_files = getattr(parent, "mod_files", self.mod_files)
-            self.check_for_updates()
+            # Only this mod changed: drop its row rather than re-checking every mod against GitHub.
+            # mod_files is the launcher's dict, so the new version also holds until its next rescan.
+            if latest_tag and mod_name in self.mod_files:
+                self.mod_files[mod_name]["version"] = latest_tag
+            self.mod_list.takeItem(row)
+            remaining = [entry for r, entry in sorted(self._updates_by_row.items()) if r != row]
+            self._updates_by_row = dict(enumerate(remaining))
+            if not remaining:
+                self.status_label.setText("All mods are up to date.")
 
         def on_error(err: str):
             QMessageBox.critical(self, "Update failed", f"Failed to update {mod_name}.\n\n{err}")